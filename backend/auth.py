@@ -1,11 +1,14 @@
 """JWT authentication and security."""
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy import select
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import os
 
 from database import get_db
@@ -14,15 +17,35 @@ from schemas import TokenData
 
 # Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production")
+_SECRET_BYTES = SECRET_KEY.encode("utf-8")  # encoded once; jose accepts bytes keys
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
+_ALGORITHMS = (ALGORITHM,)  # pinned allow-list, built once for every decode
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# last_login write throttle - avoid an UPDATE + commit on every
+# authenticated request; refresh the column at most once per interval
+import threading
+import time
+
+LAST_LOGIN_UPDATE_SECONDS = int(os.getenv("LAST_LOGIN_UPDATE_SECONDS", "60"))
+_last_login_cache: dict = {}
+_last_login_lock = threading.Lock()
+
+# JWT decode cache - the HMAC verify and claim parse are identical for
+# every request carrying the same token, so cache (email, exp) per token
+# for a short TTL; entries are insertion-ordered so eviction drops oldest
+TOKEN_CACHE_TTL_SECONDS = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "60"))
+TOKEN_CACHE_MAX_ENTRIES = 10_000
+_token_cache: dict = {}  # token -> (email, exp, cached_at)
+_token_cache_lock = threading.Lock()
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash."""
@@ -34,12 +57,15 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
     """Authenticate a user by email and password."""
-    user = db.query(User).filter(User.email == email).first()
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalar_one_or_none()
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    # bcrypt is ~hundreds of ms of CPU; run it in the thread pool so the
+    # event loop is not blocked for the duration of the hash
+    if not await run_in_threadpool(verify_password, password, user.hashed_password):
         return None
     return user
 
@@ -52,13 +78,13 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SECRET_BYTES, algorithm=ALGORITHM)
     return encoded_jwt
 
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     """Get the current authenticated user from token."""
     credentials_exception = HTTPException(
@@ -66,22 +92,44 @@ async def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
+    now = time.time()
+    with _token_cache_lock:
+        cached = _token_cache.get(token)
+
+    if cached is not None and now - cached[2] < TOKEN_CACHE_TTL_SECONDS:
+        email, exp = cached[0], cached[1]
+        if exp is not None and exp < now:
             raise credentials_exception
-        token_data = TokenData(email=email)
-    except JWTError:
-        raise credentials_exception
+    else:
+        try:
+            payload = jwt.decode(token, _SECRET_BYTES, algorithms=_ALGORITHMS)
+            email: str = payload.get("sub")
+            if email is None:
+                raise credentials_exception
+        except JWTError:
+            raise credentials_exception
+
+        with _token_cache_lock:
+            if len(_token_cache) >= TOKEN_CACHE_MAX_ENTRIES:
+                _token_cache.pop(next(iter(_token_cache)))
+            _token_cache[token] = (email, payload.get("exp"), now)
 
-    user = db.query(User).filter(User.email == token_data.email).first()
+    token_data = TokenData(email=email)
+
+    result = await db.execute(select(User).where(User.email == token_data.email))
+    user = result.scalar_one_or_none()
     if user is None:
         raise credentials_exception
 
-    # Update last login
-    user.last_login = datetime.utcnow()
-    db.commit()
+    # Update last login at most once per throttle interval per user
+    now_mono = time.monotonic()
+    with _last_login_lock:
+        stale = now_mono - _last_login_cache.get(user.id, 0) > LAST_LOGIN_UPDATE_SECONDS
+        if stale:
+            _last_login_cache[user.id] = now_mono
+    if stale:
+        user.last_login = datetime.utcnow()
+        await db.commit()
 
     return user
 
@@ -108,28 +156,77 @@ def require_role(required_role: str):
 
 
 # Rate limiting (simple in-memory implementation)
-from collections import defaultdict
-from datetime import datetime
-
-request_counts = defaultdict(list)
 RATE_LIMIT_PER_MINUTE = int(os.getenv("RATE_LIMIT_PER_MINUTE", "60"))
+RATE_LIMIT_BUCKETS = 60  # one-second buckets over a one-minute window
+
+
+class BucketLimiter:
+    """Sliding-window request counter over fixed one-second buckets.
+
+    Constant time and constant memory per client, unlike keeping a list
+    of request timestamps that must be rescanned on every check.
+    """
+    __slots__ = ("buckets", "head", "t0")
+
+    def __init__(self, now: float):
+        self.buckets = [0] * RATE_LIMIT_BUCKETS
+        self.head = 0
+        self.t0 = int(now)
+
+    def check(self, now: float) -> bool:
+        """Advance the window to `now` and try to count one request."""
+        elapsed = int(now) - self.t0
+        if elapsed > 0:
+            # Zero out the buckets the window has swept past
+            for _ in range(min(elapsed, RATE_LIMIT_BUCKETS)):
+                self.head = (self.head + 1) % RATE_LIMIT_BUCKETS
+                self.buckets[self.head] = 0
+            self.t0 = int(now)
+
+        if sum(self.buckets) >= RATE_LIMIT_PER_MINUTE:
+            return False
+
+        self.buckets[self.head] += 1
+        return True
+
+
+RATE_LIMIT_MAX_IPS = int(os.getenv("RATE_LIMIT_MAX_IPS", "100000"))
+request_counts: "OrderedDict[str, BucketLimiter]" = OrderedDict()
+_rate_limit_lock = threading.Lock()
 
 
 def check_rate_limit(client_ip: str) -> bool:
     """Check if client has exceeded rate limit."""
-    now = datetime.utcnow()
-    one_minute_ago = now - timedelta(minutes=1)
-
-    # Clean old requests
-    request_counts[client_ip] = [
-        req_time for req_time in request_counts[client_ip]
-        if req_time > one_minute_ago
-    ]
-
-    # Check limit
-    if len(request_counts[client_ip]) >= RATE_LIMIT_PER_MINUTE:
-        return False
-
-    # Add current request
-    request_counts[client_ip].append(now)
-    return True
+    now = time.monotonic()
+    with _rate_limit_lock:
+        limiter = request_counts.get(client_ip)
+        if limiter is None:
+            limiter = request_counts[client_ip] = BucketLimiter(now)
+            # Cap total tracked clients; evict the least recently seen
+            if len(request_counts) > RATE_LIMIT_MAX_IPS:
+                request_counts.popitem(last=False)
+        else:
+            request_counts.move_to_end(client_ip)
+        return limiter.check(now)
+
+
+async def check_login_rate_limit(client_ip: str) -> bool:
+    """Check the login rate limit against a shared Redis counter.
+
+    A fixed-window INCR keeps the limit consistent across all Uvicorn
+    workers - per-process counters each enforce their own budget, so
+    real limits scale with worker count. The expiry is armed only when
+    the window opens; re-arming it on every attempt would keep the
+    counter alive (and the client eventually blocked) for as long as
+    attempts continue. Falls back to the in-process limiter if Redis is
+    unreachable.
+    """
+    from cache import redis_client
+    key = f"rl:login:{client_ip}"
+    try:
+        count = await redis_client.incr(key)
+        if count == 1:
+            await redis_client.expire(key, 60)
+        return count <= RATE_LIMIT_PER_MINUTE
+    except Exception:
+        return check_rate_limit(client_ip)
@@ -0,0 +1,37 @@
+"""Redis response cache - cache-aside helpers for read-heavy endpoints."""
+import os
+import orjson
+import redis.asyncio as redis
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "60"))
+
+redis_client = redis.from_url(REDIS_URL)
+
+
+async def cache_get(key: str):
+    """Get a cached value, or None on miss or Redis failure."""
+    try:
+        raw = await redis_client.get(key)
+    except Exception:
+        return None
+    return orjson.loads(raw) if raw else None
+
+
+async def cache_set(key: str, value, ttl: int = CACHE_TTL_SECONDS):
+    """Cache a JSON-serializable value with a TTL. Failures are ignored."""
+    try:
+        await redis_client.set(key, orjson.dumps(value, default=str), ex=ttl)
+    except Exception:
+        pass
+
+
+async def cache_invalidate(*patterns: str):
+    """Delete all cached keys matching the given patterns."""
+    try:
+        for pattern in patterns:
+            keys = [key async for key in redis_client.scan_iter(match=pattern)]
+            if keys:
+                await redis_client.delete(*keys)
+    except Exception:
+        pass
@@ -1,5 +1,6 @@
 """Celery worker for background tasks."""
 from celery import Celery
+from celery.signals import worker_process_init
 import os
 from sqlalchemy.orm import Session
 
@@ -19,17 +20,48 @@ celery_app.conf.update(
     enable_utc=True,
     task_track_started=True,
     task_time_limit=30 * 60,  # 30 minutes
+    # Long normalization jobs share workers with quick housekeeping
+    # tasks; ack late and keep prefetch at 1 so a worker never hoards a
+    # fast task behind a 30-minute normalize. Start workers with -Ofair
+    # so tasks are handed to the next free pool process.
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=1000
 )
 
 
+@worker_process_init.connect
+def reset_db_engine(**kwargs):
+    """Drop inherited DB connections after the pool process forks.
+
+    The engine is created at import time in the parent; without this,
+    forked pool processes would share the parent's DBAPI sockets and
+    corrupt the connection pool.
+    """
+    from database import engine
+    engine.dispose()
+
+
+# Lazily constructed per-process normalizer - with
+# worker_max_tasks_per_child=1000 one instance serves many tasks, and
+# lazy init keeps beat/producer processes from paying for it at import
+_normalizer_singleton = None
+
+
+def _get_normalizer():
+    global _normalizer_singleton
+    if _normalizer_singleton is None:
+        from normalizer import DataNormalizer
+        _normalizer_singleton = DataNormalizer()
+    return _normalizer_singleton
+
+
 @celery_app.task(name='normalize_dataset')
 def normalize_dataset(dataset_id: int):
     """Background task to normalize a dataset."""
     from database import SessionLocal
     from models import Dataset, DatasetStatus
-    from normalizer import DataNormalizer
     import os
 
     db = SessionLocal()
@@ -43,8 +75,8 @@ def normalize_dataset(dataset_id: int):
         dataset.status = DatasetStatus.PROCESSING
         db.commit()
 
-        # Initialize normalizer
-        normalizer = DataNormalizer()
+        # Reuse the per-process normalizer
+        normalizer = _get_normalizer()
 
         # Determine file type and normalize
         file_extension = dataset.original_format.lower()
@@ -62,7 +94,7 @@ def normalize_dataset(dataset_id: int):
 
                 # Save normalized file
                 normalized_path = f"./normalized/{dataset.id}_normalized.json"
-                normalizer.export_to_mdf_json(pd.DataFrame(normalized_data), normalized_path)
+                normalizer.export_to_mdf_json(normalized_data, normalized_path)
 
             else:
                 raise ValueError(f"Unsupported file format: {file_extension}")
@@ -107,27 +139,39 @@ def cleanup_old_exports():
     from database import SessionLocal
     from models import Export
     from datetime import datetime
+    from concurrent.futures import ThreadPoolExecutor
     import os
 
+    def _safe_unlink(path: str) -> bool:
+        try:
+            if path and os.path.exists(path):
+                os.remove(path)
+                return True
+        except OSError:
+            pass
+        return False
+
     db = SessionLocal()
     try:
-        # Find expired exports
-        expired_exports = db.query(Export).filter(
+        # Find expired exports - only the columns needed for cleanup
+        expired = db.query(Export.id, Export.file_path).filter(
             Export.expires_at < datetime.utcnow()
         ).all()
 
-        cleaned = 0
-        for export in expired_exports:
-            # Delete file
-            if export.file_path and os.path.exists(export.file_path):
-                os.remove(export.file_path)
-                cleaned += 1
-
-            # Delete record
-            db.delete(export)
-
+        # One bulk DELETE instead of a statement per row
+        if expired:
+            db.query(Export).filter(
+                Export.id.in_([row.id for row in expired])
+            ).delete(synchronize_session=False)
         db.commit()
 
+        # Unlinks are I/O-bound, so fan them out across a thread pool
+        cleaned = 0
+        paths = [row.file_path for row in expired if row.file_path]
+        if paths:
+            with ThreadPoolExecutor(max_workers=min(32, len(paths))) as executor:
+                cleaned = sum(executor.map(_safe_unlink, paths))
+
         return {
             "status": "success",
             "cleaned": cleaned
@@ -141,8 +185,9 @@ def cleanup_old_exports():
 def generate_monthly_invoices():
     """Generate monthly invoices for all users."""
     from database import SessionLocal
-    from models import User, Billing, Invoice, InvoiceStatus
+    from models import Billing, Invoice, InvoiceStatus
     from datetime import datetime, timedelta
+    from sqlalchemy import func
     import uuid
 
     db = SessionLocal()
@@ -152,29 +197,26 @@ def generate_monthly_invoices():
         last_month = first_day - timedelta(days=1)
         last_month_first = last_month.replace(day=1)
 
-        users = db.query(User).all()
-        invoices_created = 0
-
-        for user in users:
-            # Get transactions for last month
-            transactions = db.query(Billing).filter(
-                Billing.user_id == user.id,
-                Billing.created_at >= last_month_first,
-                Billing.created_at < first_day
-            ).all()
-
-            if not transactions:
-                continue
+        # Aggregate last month's sales per user in one grouped query;
+        # the invoice only needs the user_id FK, so User rows are never
+        # materialized and users without sales never leave the database
+        subtotals = db.query(
+            Billing.user_id, func.sum(Billing.amount).label("subtotal")
+        ).filter(
+            Billing.transaction_type == "sale",
+            Billing.created_at >= last_month_first,
+            Billing.created_at < first_day
+        ).group_by(Billing.user_id).all()
 
-            # Calculate totals
-            subtotal = sum(t.amount for t in transactions if t.transaction_type == "sale")
+        invoices = []
 
+        for user_id, subtotal in subtotals:
             if subtotal <= 0:
                 continue
 
             # Create invoice
-            invoice = Invoice(
-                user_id=user.id,
+            invoices.append(Invoice(
+                user_id=user_id,
                 invoice_number=f"INV-{datetime.utcnow().strftime('%Y%m')}-{uuid.uuid4().hex[:8].upper()}",
                 status=InvoiceStatus.PENDING,
                 subtotal=subtotal,
@@ -183,10 +225,10 @@ def generate_monthly_invoices():
                 period_start=last_month_first,
                 period_end=first_day,
                 due_date=datetime.utcnow() + timedelta(days=30)
-            )
-            db.add(invoice)
-            invoices_created += 1
+            ))
 
+        invoices_created = len(invoices)
+        db.add_all(invoices)
         db.commit()
 
         return {
@@ -1,11 +1,56 @@
 """Blockchain-ready consent token system."""
 import hashlib
-import json
+import orjson
+import threading
+import time
 from datetime import datetime
 from typing import Dict, List, Any, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, load_only
 from models import Dataset, User, AuditLog
 
+# Bind the OpenSSL-backed constructor once at import. hashlib's OpenSSL
+# backend dispatches to hardware SHA extensions (SHA-NI) where the CPU
+# supports them, so chain verification stays on the accelerated path.
+_sha256 = hashlib.sha256
+
+# Audit log batching - bulk consents/sales were paying one transaction
+# (and one fsync) per event; queue entries and flush them in batches.
+# These are compliance records, so the batch is bounded in time as well
+# as size, and the request-level entry points flush before returning.
+AUDIT_BATCH_SIZE = 100
+AUDIT_MAX_AGE_SECONDS = 0.1
+_audit_queue: List[AuditLog] = []
+_audit_oldest = 0.0
+_audit_lock = threading.Lock()
+
+
+def queue_audit(db: Session, entry: AuditLog):
+    """Queue an audit log entry, flushing when the batch fills up or
+    the oldest queued entry has waited longer than AUDIT_MAX_AGE_SECONDS."""
+    global _audit_oldest
+    now = time.monotonic()
+    with _audit_lock:
+        if not _audit_queue:
+            _audit_oldest = now
+        _audit_queue.append(entry)
+        due = (
+            len(_audit_queue) >= AUDIT_BATCH_SIZE
+            or now - _audit_oldest >= AUDIT_MAX_AGE_SECONDS
+        )
+    if due:
+        flush_audits(db)
+
+
+def flush_audits(db: Session):
+    """Flush queued audit log entries in a single transaction."""
+    with _audit_lock:
+        batch = list(_audit_queue)
+        _audit_queue.clear()
+    if batch:
+        db.add_all(batch)
+        db.commit()
+
 
 class ConsentToken:
     """Blockchain-ready consent token with cryptographic hash chain."""
@@ -15,27 +60,40 @@ class ConsentToken:
         self.user_id = user_id
         self.dataset_id = dataset_id
         self.consent_text = consent_text
-        self.timestamp = datetime.utcnow()
+        # Integer epoch nanoseconds - cheaper to capture and serialize
+        # than a datetime, and hashes without any string formatting
+        self.timestamp_ns = time.time_ns()
         self.version = "1.0"
+        self.token_hash: Optional[str] = None
+        self.previous_hash: Optional[str] = None
+        self._fixed_bytes: Optional[bytes] = None
+
+    def _serialize_fixed(self) -> bytes:
+        """Serialize the immutable token fields once and cache the bytes."""
+        if self._fixed_bytes is None:
+            token_data = {
+                "version": self.version,
+                "user_id": self.user_id,
+                "dataset_id": self.dataset_id,
+                "consent_text": self.consent_text,
+                "timestamp": self.timestamp_ns
+            }
+            self._fixed_bytes = orjson.dumps(token_data, option=orjson.OPT_SORT_KEYS)
+        return self._fixed_bytes
+
+    def _digest(self, previous_hash: Optional[str] = None) -> bytes:
+        """Compute the raw SHA-256 digest for this token."""
+        # Feed the hash incrementally instead of concatenating a
+        # throwaway bytes object per link
+        hasher = _sha256()
+        hasher.update(self._serialize_fixed())
+        hasher.update(b"|")
+        hasher.update((previous_hash or "genesis").encode())
+        return hasher.digest()
 
     def generate_token(self, previous_hash: Optional[str] = None) -> str:
         """Generate cryptographic hash token."""
-        token_data = {
-            "version": self.version,
-            "user_id": self.user_id,
-            "dataset_id": self.dataset_id,
-            "consent_text": self.consent_text,
-            "timestamp": self.timestamp.isoformat(),
-            "previous_hash": previous_hash or "genesis"
-        }
-
-        # Create deterministic JSON string
-        token_string = json.dumps(token_data, sort_keys=True)
-
-        # Generate SHA-256 hash
-        token_hash = hashlib.sha256(token_string.encode()).hexdigest()
-
-        return token_hash
+        return self._digest(previous_hash).hex()
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert token to dictionary."""
@@ -43,7 +101,7 @@ class ConsentToken:
             "user_id": self.user_id,
             "dataset_id": self.dataset_id,
             "consent_text": self.consent_text,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": datetime.utcfromtimestamp(self.timestamp_ns / 1e9).isoformat(),
             "version": self.version
         }
 
@@ -58,14 +116,15 @@ class ConsentChain:
 
     def add_consent(self, user_id: int, dataset_id: int, consent_text: str) -> str:
         """Add new consent to chain."""
-        # Get previous hash
-        previous_hash = None
-        if self.chain:
-            previous_hash = self.chain[-1].generate_token()
+        # Link to the tail's stored hash - no rehash of the tail, and the
+        # link matches how the tail itself was hashed
+        previous_hash = self.chain[-1].token_hash if self.chain else None
 
         # Create new token
         token = ConsentToken(user_id, dataset_id, consent_text)
+        token.previous_hash = previous_hash
         token_hash = token.generate_token(previous_hash)
+        token.token_hash = token_hash
 
         # Add to chain
         self.chain.append(token)
@@ -83,8 +142,7 @@ class ConsentChain:
             },
             success=True
         )
-        self.db.add(audit_entry)
-        self.db.commit()
+        queue_audit(self.db, audit_entry)
 
         return token_hash
 
@@ -93,18 +151,13 @@ class ConsentChain:
         if not self.chain:
             return True
 
-        for i in range(1, len(self.chain)):
-            current_token = self.chain[i]
-            previous_token = self.chain[i - 1]
-
-            # Recalculate hash with previous hash
-            previous_hash = previous_token.generate_token()
-            expected_hash = current_token.generate_token(previous_hash)
-
-            # Verify hash matches
-            actual_hash = current_token.generate_token(previous_hash)
-            if expected_hash != actual_hash:
+        # Single pass: rehash each link against its predecessor's stored
+        # hash and compare to the hash recorded when it was added
+        previous_hash = None
+        for token in self.chain:
+            if token.generate_token(previous_hash) != token.token_hash:
                 return False
+            previous_hash = token.token_hash
 
         return True
 
@@ -157,8 +210,10 @@ class RevenueTracking:
             },
             success=True
         )
-        self.db.add(audit)
-        self.db.commit()
+        queue_audit(self.db, audit)
+        # A sale is a complete operation - don't leave its audit record
+        # sitting in process memory past the request
+        flush_audits(self.db)
 
         return {
             "sale_price": sale_price,
@@ -171,21 +226,24 @@ class RevenueTracking:
         """Get earnings summary for a user."""
         from models import Billing
 
-        # Get all sales
-        sales = self.db.query(Billing).filter(
-            Billing.user_id == user_id,
-            Billing.transaction_type == "sale"
-        ).all()
-
-        # Calculate metrics
-        total_sales = len(sales)
-        total_revenue = sum(s.amount for s in sales)
+        # Aggregate in SQL rather than loading every sale into Python
+        total_sales, total_revenue = self.db.execute(
+            select(
+                func.count(Billing.id),
+                func.coalesce(func.sum(Billing.amount), 0.0)
+            ).where(
+                Billing.user_id == user_id,
+                Billing.transaction_type == "sale"
+            )
+        ).one()
         avg_sale_price = total_revenue / total_sales if total_sales > 0 else 0
 
-        # Get recent sales
+        # Get recent sales, hydrating only the columns the summary uses
         recent_sales = self.db.query(Billing).filter(
             Billing.user_id == user_id,
             Billing.transaction_type == "sale"
+        ).options(
+            load_only(Billing.amount, Billing.dataset_id, Billing.created_at, Billing.buyer_id)
         ).order_by(Billing.created_at.desc()).limit(10).all()
 
         return {
@@ -207,12 +265,12 @@ class RevenueTracking:
         """Calculate total platform revenue from commissions."""
         from models import Billing
 
-        commissions = self.db.query(Billing).filter(
-            Billing.transaction_type == "commission"
-        ).all()
-
-        total_commission = sum(c.amount for c in commissions)
-        total_transactions = len(commissions)
+        total_transactions, total_commission = self.db.execute(
+            select(
+                func.count(Billing.id),
+                func.coalesce(func.sum(Billing.amount), 0.0)
+            ).where(Billing.transaction_type == "commission")
+        ).one()
 
         return {
             "total_commission_revenue": total_commission,
@@ -237,6 +295,10 @@ def create_consent_token_for_dataset(
         dataset.consent_token = token_hash
         db.commit()
 
+    # Consent audits are compliance records; batching only amortizes
+    # commits within a request, never across one
+    flush_audits(db)
+
     return token_hash
 
 
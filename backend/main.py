@@ -1,15 +1,22 @@
 """Main FastAPI application - Mist Data Steward."""
-from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, Request
+from fastapi import FastAPI, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
-from sqlalchemy.orm import Session
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
 from typing import List
 from datetime import datetime, timedelta
+import aiofiles
+import aiofiles.os
+import hashlib
 import os
-import shutil
 from pathlib import Path
 
-from database import get_db, init_db, check_db_health
+from cache import cache_get, cache_set, cache_invalidate
+from database import AsyncSessionLocal, get_db, init_db, check_db_health
 from models import User, Dataset, Export, Billing, AuditLog, UserRole, DatasetStatus
 from schemas import (
     UserCreate, UserLogin, UserResponse, UserUpdate, Token,
@@ -21,16 +28,24 @@ from schemas import (
 )
 from auth import (
     authenticate_user, create_access_token, get_current_active_user,
-    get_password_hash, check_rate_limit, require_role
+    get_password_hash, check_login_rate_limit, require_role
 )
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Mist Data Steward API",
     description="Patient-empowered data sovereignty platform",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
+# Pre-built adapters for the list endpoints - dumping through them skips
+# FastAPI's per-field response validation pass on trusted ORM rows
+_dataset_list_adapter = TypeAdapter(List[DatasetResponse])
+_billing_list_adapter = TypeAdapter(List[BillingResponse])
+_user_list_adapter = TypeAdapter(List[UserResponse])
+_listing_list_adapter = TypeAdapter(List[MarketplaceListingResponse])
+
 # CORS configuration
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:5173").split(",")
 app.add_middleware(
@@ -50,6 +65,31 @@ EXPORT_DIR = Path(os.getenv("EXPORT_DIR", "./exports"))
 for directory in [UPLOAD_DIR, NORMALIZED_DIR, EXPORT_DIR]:
     directory.mkdir(parents=True, exist_ok=True)
 
+# Chunk size for streamed file I/O
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Request-path limits, parsed once at import instead of per request
+MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE_MB", "100")) * 1024 * 1024
+COMMISSION_RATE = float(os.getenv("COMMISSION_RATE", "0.12"))
+
+
+async def _stream_file(path: str, chunk_size: int = UPLOAD_CHUNK_SIZE):
+    """Yield a file in chunks for streaming responses."""
+    async with aiofiles.open(path, "rb") as f:
+        while chunk := await f.read(chunk_size):
+            yield chunk
+
+
+async def _write_audit(**fields) -> None:
+    """Persist an audit log entry after the response has been sent.
+
+    Runs as a background task with its own session so the audit commit's
+    fsync is off the request's critical path.
+    """
+    async with AsyncSessionLocal() as session:
+        session.add(AuditLog(**fields))
+        await session.commit()
+
 
 # ==================== HEALTH & INFO ====================
 
@@ -80,54 +120,62 @@ def health_check():
 # ==================== AUTHENTICATION ====================
 
 @app.post("/auth/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(
+    user: UserCreate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
+):
     """Register a new user."""
     # Check if email already exists
-    existing_user = db.query(User).filter(User.email == user.email).first()
-    if existing_user:
+    result = await db.execute(select(User).where(User.email == user.email))
+    if result.scalar_one_or_none():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
-    # Create new user
+    # Create new user (bcrypt hashing runs off the event loop)
+    hashed_password = await run_in_threadpool(get_password_hash, user.password)
     db_user = User(
         email=user.email,
         full_name=user.full_name,
         role=user.role,
-        hashed_password=get_password_hash(user.password)
+        hashed_password=hashed_password
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
 
-    # Create audit log
-    log = AuditLog(
+    # Audit the registration after the response is flushed
+    background_tasks.add_task(
+        _write_audit,
         user_id=db_user.id,
         event_type="user_registered",
         resource_type="user",
         resource_id=db_user.id,
         success=True
     )
-    db.add(log)
-    db.commit()
 
     return db_user
 
 
 @app.post("/auth/login", response_model=Token)
-def login_user(user_login: UserLogin, request: Request, db: Session = Depends(get_db)):
+async def login_user(
+    user_login: UserLogin,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
+):
     """Login user and return JWT token."""
     # Rate limiting
     client_ip = request.client.host
-    if not check_rate_limit(client_ip):
+    if not await check_login_rate_limit(client_ip):
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Too many requests"
         )
 
     # Authenticate user
-    user = authenticate_user(db, user_login.email, user_login.password)
+    user = await authenticate_user(db, user_login.email, user_login.password)
     if not user:
         # Log failed attempt
         log = AuditLog(
@@ -137,7 +185,7 @@ def login_user(user_login: UserLogin, request: Request, db: Session = Depends(ge
             success=False
         )
         db.add(log)
-        db.commit()
+        await db.commit()
 
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -147,8 +195,10 @@ def login_user(user_login: UserLogin, request: Request, db: Session = Depends(ge
     # Create access token
     access_token = create_access_token(data={"sub": user.email})
 
-    # Log successful login
-    log = AuditLog(
+    # Log successful login off the critical path; failed attempts above
+    # stay inline because background tasks don't run for error responses
+    background_tasks.add_task(
+        _write_audit,
         user_id=user.id,
         event_type="login_success",
         resource_type="user",
@@ -156,8 +206,6 @@ def login_user(user_login: UserLogin, request: Request, db: Session = Depends(ge
         ip_address=client_ip,
         success=True
     )
-    db.add(log)
-    db.commit()
 
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -169,10 +217,10 @@ def get_current_user_info(current_user: User = Depends(get_current_active_user))
 
 
 @app.put("/auth/me", response_model=UserResponse)
-def update_current_user(
+async def update_current_user(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update current user profile."""
     if user_update.full_name is not None:
@@ -184,38 +232,49 @@ def update_current_user(
     if user_update.research_interests is not None:
         current_user.research_interests = user_update.research_interests
 
-    db.commit()
-    db.refresh(current_user)
+    db.add(current_user)
+    await db.commit()
     return current_user
 
 
 # ==================== DATASETS ====================
 
 @app.get("/datasets", response_model=List[DatasetResponse])
-def list_datasets(
+async def list_datasets(
     skip: int = 0,
     limit: int = 100,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """List user's datasets."""
-    datasets = db.query(Dataset).filter(
-        Dataset.owner_id == current_user.id
-    ).offset(skip).limit(limit).all()
-    return datasets
+    result = await db.execute(
+        select(Dataset).where(
+            Dataset.owner_id == current_user.id
+        ).offset(skip).limit(limit)
+    )
+    # validate_python maps the ORM rows (from_attributes comes from the
+    # response model config); dump_json then serializes in one C call
+    rows = _dataset_list_adapter.validate_python(result.scalars().all())
+    return Response(
+        content=_dataset_list_adapter.dump_json(rows),
+        media_type="application/json"
+    )
 
 
 @app.get("/datasets/{dataset_id}", response_model=DatasetDetailResponse)
-def get_dataset(
+async def get_dataset(
     dataset_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get dataset details."""
-    dataset = db.query(Dataset).filter(
-        Dataset.id == dataset_id,
-        Dataset.owner_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(Dataset).where(
+            Dataset.id == dataset_id,
+            Dataset.owner_id == current_user.id
+        )
+    )
+    dataset = result.scalar_one_or_none()
 
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
@@ -224,17 +283,20 @@ def get_dataset(
 
 
 @app.put("/datasets/{dataset_id}", response_model=DatasetResponse)
-def update_dataset(
+async def update_dataset(
     dataset_id: int,
     dataset_update: DatasetUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update dataset metadata."""
-    dataset = db.query(Dataset).filter(
-        Dataset.id == dataset_id,
-        Dataset.owner_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(Dataset).where(
+            Dataset.id == dataset_id,
+            Dataset.owner_id == current_user.id
+        )
+    )
+    dataset = result.scalar_one_or_none()
 
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
@@ -246,36 +308,44 @@ def update_dataset(
     if dataset_update.price is not None:
         dataset.price = dataset_update.price
 
-    db.commit()
-    db.refresh(dataset)
+    await db.commit()
+
+    await cache_invalidate("marketplace:listings:*", f"stats:dashboard:{current_user.id}")
     return dataset
 
 
 @app.delete("/datasets/{dataset_id}")
-def delete_dataset(
+async def delete_dataset(
     dataset_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a dataset."""
-    dataset = db.query(Dataset).filter(
-        Dataset.id == dataset_id,
-        Dataset.owner_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(Dataset).where(
+            Dataset.id == dataset_id,
+            Dataset.owner_id == current_user.id
+        )
+    )
+    dataset = result.scalar_one_or_none()
 
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
 
-    # Delete files
-    if dataset.upload_path and os.path.exists(dataset.upload_path):
-        os.remove(dataset.upload_path)
-    if dataset.normalized_path and os.path.exists(dataset.normalized_path):
-        os.remove(dataset.normalized_path)
+    # Delete files without blocking the event loop - unlink can stall on
+    # networked storage
+    if dataset.upload_path and await aiofiles.os.path.exists(dataset.upload_path):
+        await aiofiles.os.remove(dataset.upload_path)
+    if dataset.normalized_path and await aiofiles.os.path.exists(dataset.normalized_path):
+        await aiofiles.os.remove(dataset.normalized_path)
 
     # Delete from database
-    db.delete(dataset)
-    db.commit()
+    await db.delete(dataset)
+    await db.commit()
 
+    await cache_invalidate(
+        "marketplace:listings:*", f"stats:dashboard:{current_user.id}", "stats:admin"
+    )
     return {"message": "Dataset deleted successfully"}
 
 
@@ -283,27 +353,31 @@ def delete_dataset(
 
 @app.post("/ingest", response_model=FileUploadResponse)
 async def upload_file(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Upload a data file for processing."""
-    # Validate file size
-    MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE_MB", "100")) * 1024 * 1024
-    file.file.seek(0, 2)
-    file_size = file.file.tell()
-    file.file.seek(0)
-
-    if file_size > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File too large. Max size: {MAX_FILE_SIZE / 1024 / 1024}MB"
-        )
-
-    # Save file
+    # Stream the upload to disk in chunks - memory stays at one chunk
+    # regardless of upload size, and the event loop is never blocked on
+    # disk writes. Size is tracked incrementally instead of seek/tell.
     file_path = UPLOAD_DIR / f"{current_user.id}_{datetime.utcnow().timestamp()}_{file.filename}"
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    file_size = 0
+    try:
+        async with aiofiles.open(file_path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                file_size += len(chunk)
+                if file_size > MAX_FILE_SIZE:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File too large. Max size: {MAX_FILE_SIZE / 1024 / 1024}MB"
+                    )
+                await buffer.write(chunk)
+    except HTTPException:
+        if await aiofiles.os.path.exists(file_path):
+            await aiofiles.os.remove(file_path)
+        raise
 
     # Create dataset record
     dataset = Dataset(
@@ -315,14 +389,17 @@ async def upload_file(
         status=DatasetStatus.UPLOADED
     )
     db.add(dataset)
-    db.commit()
-    db.refresh(dataset)
+    await db.commit()
+
+    # A new dataset changes the owner's dashboard counts immediately
+    await cache_invalidate(f"stats:dashboard:{current_user.id}")
 
     # TODO: Trigger Celery task for normalization
     # normalize_dataset.delay(dataset.id)
 
-    # Create audit log
-    log = AuditLog(
+    # Audit the upload after the response is flushed
+    background_tasks.add_task(
+        _write_audit,
         user_id=current_user.id,
         event_type="file_uploaded",
         resource_type="dataset",
@@ -330,8 +407,6 @@ async def upload_file(
         details={"filename": file.filename, "size": file_size},
         success=True
     )
-    db.add(log)
-    db.commit()
 
     return FileUploadResponse(
         dataset_id=dataset.id,
@@ -345,17 +420,20 @@ async def upload_file(
 # ==================== EXPORTS ====================
 
 @app.post("/exports", response_model=ExportResponse)
-def create_export(
+async def create_export(
     export_request: ExportCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create an export of normalized data."""
     # Verify dataset ownership
-    dataset = db.query(Dataset).filter(
-        Dataset.id == export_request.dataset_id,
-        Dataset.owner_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(Dataset).where(
+            Dataset.id == export_request.dataset_id,
+            Dataset.owner_id == current_user.id
+        )
+    )
+    dataset = result.scalar_one_or_none()
 
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
@@ -381,23 +459,25 @@ def create_export(
         expires_at=datetime.utcnow() + timedelta(days=7)
     )
     db.add(export)
-    db.commit()
-    db.refresh(export)
+    await db.commit()
 
     return export
 
 
 @app.get("/exports/{export_id}/download")
-def download_export(
+async def download_export(
     export_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Download an export file."""
-    export = db.query(Export).filter(
-        Export.id == export_id,
-        Export.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(Export).where(
+            Export.id == export_id,
+            Export.user_id == current_user.id
+        )
+    )
+    export = result.scalar_one_or_none()
 
     if not export:
         raise HTTPException(status_code=404, detail="Export not found")
@@ -411,28 +491,35 @@ def download_export(
     # Update download count
     export.download_count += 1
     export.last_downloaded = datetime.utcnow()
-    db.commit()
+    await db.commit()
 
-    return FileResponse(
-        export.file_path,
+    # Stream the export - memory stays at one chunk and the first bytes
+    # go out before the whole file is read
+    filename = os.path.basename(export.file_path)
+    return StreamingResponse(
+        _stream_file(export.file_path),
         media_type="application/octet-stream",
-        filename=os.path.basename(export.file_path)
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
     )
 
 
 # ==================== CONSENT ====================
 
 @app.post("/consent", response_model=ConsentResponse)
-def create_consent(
+async def create_consent(
     consent: ConsentCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Record user consent for data usage."""
-    dataset = db.query(Dataset).filter(
-        Dataset.id == consent.dataset_id,
-        Dataset.owner_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(Dataset).where(
+            Dataset.id == consent.dataset_id,
+            Dataset.owner_id == current_user.id
+        )
+    )
+    dataset = result.scalar_one_or_none()
 
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
@@ -440,16 +527,20 @@ def create_consent(
     if not consent.agreed:
         raise HTTPException(status_code=400, detail="Consent must be agreed to")
 
-    # Generate consent token (simplified - in production, use blockchain)
-    import hashlib
-    consent_data = f"{current_user.id}:{consent.dataset_id}:{datetime.utcnow().isoformat()}:{consent.consent_text}"
-    consent_token = hashlib.sha256(consent_data.encode()).hexdigest()
+    # Generate consent token (simplified - in production, use blockchain).
+    # Feed the hasher incrementally so the consent text is never copied
+    # into a concatenated intermediate string.
+    hasher = hashlib.sha256()
+    hasher.update(f"{current_user.id}:{consent.dataset_id}:{datetime.utcnow().isoformat()}:".encode())
+    hasher.update(consent.consent_text.encode())
+    consent_token = hasher.hexdigest()
 
     dataset.consent_token = consent_token
-    db.commit()
+    await db.commit()
 
-    # Create audit log
-    log = AuditLog(
+    # Audit the consent grant after the response is flushed
+    background_tasks.add_task(
+        _write_audit,
         user_id=current_user.id,
         event_type="consent_given",
         resource_type="dataset",
@@ -457,8 +548,6 @@ def create_consent(
         details={"consent_token": consent_token},
         success=True
     )
-    db.add(log)
-    db.commit()
 
     return ConsentResponse(
         dataset_id=dataset.id,
@@ -470,18 +559,28 @@ def create_consent(
 # ==================== MARKETPLACE ====================
 
 @app.get("/marketplace/listings", response_model=List[MarketplaceListingResponse])
-def list_marketplace(
+async def list_marketplace(
     skip: int = 0,
     limit: int = 50,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """List datasets available for purchase."""
-    datasets = db.query(Dataset).filter(
-        Dataset.is_for_sale == True,
-        Dataset.status == DatasetStatus.NORMALIZED,
-        Dataset.owner_id != current_user.id  # Don't show user's own datasets
-    ).offset(skip).limit(limit).all()
+    cache_key = f"marketplace:listings:{current_user.id}:{skip}:{limit}"
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(cached)
+
+    # Eager-load owners in one batched IN (...) query instead of one
+    # SELECT per listing
+    result = await db.execute(
+        select(Dataset).options(selectinload(Dataset.owner)).where(
+            Dataset.is_for_sale == True,
+            Dataset.status == DatasetStatus.NORMALIZED,
+            Dataset.owner_id != current_user.id  # Don't show user's own datasets
+        ).offset(skip).limit(limit)
+    )
+    datasets = result.scalars().all()
 
     listings = []
     for dataset in datasets:
@@ -498,20 +597,25 @@ def list_marketplace(
             seller_organization=dataset.owner.organization
         ))
 
-    return listings
+    payload = _listing_list_adapter.dump_python(listings, mode="json")
+    await cache_set(cache_key, payload)
+    return ORJSONResponse(payload)
 
 
 @app.post("/marketplace/purchase")
-def purchase_dataset(
+async def purchase_dataset(
     purchase: MarketplacePurchaseRequest,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Purchase a dataset from the marketplace."""
-    dataset = db.query(Dataset).filter(
-        Dataset.id == purchase.dataset_id,
-        Dataset.is_for_sale == True
-    ).first()
+    result = await db.execute(
+        select(Dataset).where(
+            Dataset.id == purchase.dataset_id,
+            Dataset.is_for_sale == True
+        )
+    )
+    dataset = result.scalar_one_or_none()
 
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found or not for sale")
@@ -522,49 +626,51 @@ def purchase_dataset(
     # TODO: Process payment with Stripe using purchase.payment_method_id
 
     # Calculate commission (12%)
-    commission_rate = float(os.getenv("COMMISSION_RATE", "0.12"))
-    commission = dataset.price * commission_rate
+    commission = dataset.price * COMMISSION_RATE
     seller_amount = dataset.price - commission
 
-    # Create billing records
-    purchase_record = Billing(
-        user_id=current_user.id,
-        transaction_type="purchase",
-        amount=dataset.price,
-        buyer_id=current_user.id,
-        seller_id=dataset.owner_id,
-        dataset_id=dataset.id,
-        description=f"Purchased dataset: {dataset.filename}"
-    )
-
-    seller_record = Billing(
-        user_id=dataset.owner_id,
-        transaction_type="sale",
-        amount=seller_amount,
-        buyer_id=current_user.id,
-        seller_id=dataset.owner_id,
-        dataset_id=dataset.id,
-        commission_amount=commission,
-        description=f"Sold dataset: {dataset.filename}"
-    )
-
-    commission_record = Billing(
-        user_id=dataset.owner_id,
-        transaction_type="commission",
-        amount=commission,
-        buyer_id=current_user.id,
-        seller_id=dataset.owner_id,
-        dataset_id=dataset.id,
-        description=f"Platform commission for: {dataset.filename}"
-    )
-
-    db.add_all([purchase_record, seller_record, commission_record])
+    # Create billing records in one executemany INSERT instead of three
+    # unit-of-work round trips
+    billing_rows = [
+        {
+            "user_id": current_user.id,
+            "transaction_type": "purchase",
+            "amount": dataset.price,
+            "buyer_id": current_user.id,
+            "seller_id": dataset.owner_id,
+            "dataset_id": dataset.id,
+            "description": f"Purchased dataset: {dataset.filename}"
+        },
+        {
+            "user_id": dataset.owner_id,
+            "transaction_type": "sale",
+            "amount": seller_amount,
+            "buyer_id": current_user.id,
+            "seller_id": dataset.owner_id,
+            "dataset_id": dataset.id,
+            "commission_amount": commission,
+            "description": f"Sold dataset: {dataset.filename}"
+        },
+        {
+            "user_id": dataset.owner_id,
+            "transaction_type": "commission",
+            "amount": commission,
+            "buyer_id": current_user.id,
+            "seller_id": dataset.owner_id,
+            "dataset_id": dataset.id,
+            "description": f"Platform commission for: {dataset.filename}"
+        }
+    ]
+    await db.execute(insert(Billing), billing_rows)
 
     # Update user balances
+    seller = await db.get(User, dataset.owner_id)
     current_user.total_spent += dataset.price
-    dataset.owner.total_earnings += seller_amount
+    seller.total_earnings += seller_amount
 
-    db.commit()
+    await db.commit()
+
+    await cache_invalidate("marketplace:listings:*", "stats:admin")
 
     return {
         "message": "Purchase successful",
@@ -576,100 +682,153 @@ def purchase_dataset(
 # ==================== BILLING ====================
 
 @app.get("/billing/transactions", response_model=List[BillingResponse])
-def list_transactions(
+async def list_transactions(
     skip: int = 0,
     limit: int = 100,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """List user's billing transactions."""
-    transactions = db.query(Billing).filter(
-        Billing.user_id == current_user.id
-    ).order_by(Billing.created_at.desc()).offset(skip).limit(limit).all()
-
-    return transactions
+    result = await db.execute(
+        select(Billing).where(
+            Billing.user_id == current_user.id
+        ).order_by(Billing.created_at.desc()).offset(skip).limit(limit)
+    )
+    rows = _billing_list_adapter.validate_python(result.scalars().all())
+    return Response(
+        content=_billing_list_adapter.dump_json(rows),
+        media_type="application/json"
+    )
 
 
 @app.get("/billing/earnings")
-def get_earnings(
+async def get_earnings(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get user's earnings summary."""
-    sales = db.query(Billing).filter(
-        Billing.user_id == current_user.id,
-        Billing.transaction_type == "sale"
-    ).all()
+    # Aggregate in SQL - no need to pull the full sales history over
+    # the wire just to count and average it
+    total_sales, avg_sale_price = (await db.execute(
+        select(func.count(Billing.id), func.avg(Billing.amount)).where(
+            Billing.user_id == current_user.id,
+            Billing.transaction_type == "sale"
+        )
+    )).one()
+
+    # Only the ten newest sales leave the database, and only the columns
+    # the summary shows; ix_billing_user_created serves the sort
+    result = await db.execute(
+        select(Billing).options(
+            load_only(
+                Billing.id, Billing.transaction_type, Billing.amount,
+                Billing.currency, Billing.description, Billing.created_at
+            )
+        ).where(
+            Billing.user_id == current_user.id,
+            Billing.transaction_type == "sale"
+        ).order_by(Billing.created_at.desc()).limit(10)
+    )
+    recent_sales = result.scalars().all()
 
     return {
         "total_earnings": current_user.total_earnings,
-        "total_sales": len(sales),
-        "average_sale_price": sum(s.amount for s in sales) / len(sales) if sales else 0,
-        "recent_sales": sales[:10]
+        "total_sales": total_sales,
+        "average_sale_price": float(avg_sale_price) if avg_sale_price is not None else 0,
+        "recent_sales": recent_sales
     }
 
 
 # ==================== DASHBOARD ====================
 
 @app.get("/dashboard/stats", response_model=DashboardStats)
-def get_dashboard_stats(
+async def get_dashboard_stats(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get dashboard statistics."""
-    datasets = db.query(Dataset).filter(Dataset.owner_id == current_user.id).all()
-
-    total_datasets = len(datasets)
-    normalized_datasets = len([d for d in datasets if d.status == DatasetStatus.NORMALIZED])
-    total_records = sum(d.total_records or 0 for d in datasets)
-
-    recent_uploads = db.query(Dataset).filter(
-        Dataset.owner_id == current_user.id
-    ).order_by(Dataset.created_at.desc()).limit(5).all()
+    cache_key = f"stats:dashboard:{current_user.id}"
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Aggregate the counts in one round trip instead of hydrating every
+    # dataset row just to count and sum over it
+    total_datasets, normalized_datasets, total_records = (await db.execute(
+        select(
+            func.count(),
+            func.count().filter(Dataset.status == DatasetStatus.NORMALIZED),
+            func.coalesce(func.sum(Dataset.total_records), 0)
+        ).where(Dataset.owner_id == current_user.id)
+    )).one()
+
+    result = await db.execute(
+        select(Dataset).where(
+            Dataset.owner_id == current_user.id
+        ).order_by(Dataset.created_at.desc()).limit(5)
+    )
+    recent_uploads = result.scalars().all()
 
-    return DashboardStats(
+    stats = DashboardStats(
         total_datasets=total_datasets,
         normalized_datasets=normalized_datasets,
         total_earnings=current_user.total_earnings,
         total_records_processed=total_records,
         recent_uploads=recent_uploads
     )
+    await cache_set(cache_key, stats.model_dump(mode="json"))
+    return stats
 
 
 # ==================== ADMIN ====================
 
 @app.get("/admin/users", response_model=List[UserResponse])
-def list_all_users(
+async def list_all_users(
     skip: int = 0,
     limit: int = 100,
     current_user: User = Depends(require_role("admin")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Admin: List all users."""
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
+    result = await db.execute(select(User).offset(skip).limit(limit))
+    rows = _user_list_adapter.validate_python(result.scalars().all())
+    return Response(
+        content=_user_list_adapter.dump_json(rows),
+        media_type="application/json"
+    )
 
 
 @app.get("/admin/stats")
-def get_admin_stats(
+async def get_admin_stats(
     current_user: User = Depends(require_role("admin")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Admin: Get platform statistics."""
-    total_users = db.query(User).count()
-    total_datasets = db.query(Dataset).count()
-    total_transactions = db.query(Billing).count()
-    total_revenue = db.query(Billing).filter(
-        Billing.transaction_type == "commission"
-    ).all()
+    cached = await cache_get("stats:admin")
+    if cached is not None:
+        return cached
+
+    total_users = (await db.execute(select(func.count()).select_from(User))).scalar_one()
+    total_datasets = (await db.execute(select(func.count()).select_from(Dataset))).scalar_one()
+    total_transactions = (await db.execute(select(func.count()).select_from(Billing))).scalar_one()
+    total_revenue = (await db.execute(
+        select(func.coalesce(func.sum(Billing.amount), 0.0)).where(
+            Billing.transaction_type == "commission"
+        )
+    )).scalar_one()
+    active_listings = (await db.execute(
+        select(func.count()).select_from(Dataset).where(Dataset.is_for_sale == True)
+    )).scalar_one()
 
-    return {
+    stats = {
         "total_users": total_users,
         "total_datasets": total_datasets,
         "total_transactions": total_transactions,
-        "total_revenue": sum(t.amount for t in total_revenue),
-        "active_listings": db.query(Dataset).filter(Dataset.is_for_sale == True).count()
+        "total_revenue": total_revenue,
+        "active_listings": active_listings
     }
+    await cache_set("stats:admin", stats)
+    return stats
 
 
 # ==================== ERROR HANDLERS ====================
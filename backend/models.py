@@ -1,6 +1,6 @@
 """SQLAlchemy database models."""
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, Enum as SQLEnum, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, CheckConstraint, JSON, Index
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from database import Base
 import enum
@@ -33,20 +33,34 @@ class InvoiceStatus(str, enum.Enum):
     FAILED = "failed"
 
 
+# Marketplace data categories recognized in buyer research interests
+COMMON_DATA_CATEGORIES = ("vitals", "labs", "medications", "diagnoses", "procedures")
+
+
 class User(Base):
     """User model - patients, buyers, and admins."""
     __tablename__ = "users"
+    # Fetch server-generated columns via INSERT/UPDATE .. RETURNING so
+    # handlers don't need a refresh round trip after commit
+    __mapper_args__ = {"eager_defaults": True}
+    # Plain strings with CHECK constraints instead of native enum types:
+    # inserts skip the pg_type OID translation and adding a value is a
+    # constraint swap, not an ALTER TYPE
+    __table_args__ = (
+        CheckConstraint("role IN ('patient', 'buyer', 'admin')", name="ck_users_role"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String(255), unique=True, index=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
     full_name = Column(String(255))
-    role = Column(SQLEnum(UserRole), default=UserRole.PATIENT, nullable=False)
+    role = Column(String(32), default=UserRole.PATIENT, nullable=False)
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
     phone = Column(String(50))
     organization = Column(String(255))  # For buyers
     research_interests = Column(Text)  # For buyers
+    interest_categories = Column(JSON)  # Derived from research_interests on write
 
     # Billing
     stripe_customer_id = Column(String(255))
@@ -64,6 +78,17 @@ class User(Base):
     billing_records = relationship("Billing", back_populates="user", cascade="all, delete-orphan")
     audit_logs = relationship("AuditLog", back_populates="user", cascade="all, delete-orphan")
 
+    @validates("research_interests")
+    def _derive_interest_categories(self, key, value):
+        """Keep interest_categories in sync so recommendations never
+        re-parse the free-text interests per call."""
+        if value:
+            words = set(value.lower().split())
+            self.interest_categories = [c for c in COMMON_DATA_CATEGORIES if c in words]
+        else:
+            self.interest_categories = []
+        return value
+
     def __repr__(self):
         return f"<User {self.email} ({self.role})>"
 
@@ -71,6 +96,13 @@ class User(Base):
 class Dataset(Base):
     """Dataset model - uploaded and normalized data."""
     __tablename__ = "datasets"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('uploaded', 'processing', 'normalized', 'failed')",
+            name="ck_datasets_status"
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -83,7 +115,7 @@ class Dataset(Base):
     normalized_path = Column(String(500))
 
     # Processing
-    status = Column(SQLEnum(DatasetStatus), default=DatasetStatus.UPLOADED, nullable=False)
+    status = Column(String(32), default=DatasetStatus.UPLOADED, nullable=False, index=True)
     error_message = Column(Text)
 
     # Normalization metadata
@@ -117,6 +149,34 @@ class Dataset(Base):
         return f"<Dataset {self.filename} ({self.status})>"
 
 
+# GIN full-text index backing marketplace search; the expression must
+# match the one search_marketplace queries with so the planner uses it
+Index(
+    "ix_datasets_fts",
+    func.to_tsvector(
+        "english",
+        func.coalesce(Dataset.filename, "").concat(" ").concat(
+            func.coalesce(Dataset.description, "")
+        )
+    ),
+    postgresql_using="gin"
+)
+
+# Composite index for the per-owner listings and dashboard filters
+Index("ix_datasets_owner_status", Dataset.owner_id, Dataset.status)
+
+# Marketplace listings filter on both sale flag and normalization status
+Index("ix_datasets_sale_status", Dataset.is_for_sale, Dataset.status)
+
+# Partial index for marketplace queries - most rows are not for sale,
+# so indexing only the true rows keeps it tiny
+Index(
+    "ix_datasets_for_sale",
+    Dataset.is_for_sale,
+    postgresql_where=(Dataset.is_for_sale == True)
+)
+
+
 class Mapping(Base):
     """Field mapping model - tracks UDT to MDF conversions."""
     __tablename__ = "mappings"
@@ -147,13 +207,20 @@ class Mapping(Base):
 class Export(Base):
     """Export model - tracks data exports."""
     __tablename__ = "exports"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        CheckConstraint(
+            "format IN ('csv', 'json', 'excel', 'fhir')",
+            name="ck_exports_format"
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     dataset_id = Column(Integer, ForeignKey("datasets.id", ondelete="SET NULL"))
 
     # Export details
-    format = Column(SQLEnum(ExportFormat), nullable=False)
+    format = Column(String(32), nullable=False)
     file_path = Column(String(500))
     file_size = Column(Integer)
 
@@ -181,7 +248,7 @@ class Billing(Base):
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
     # Transaction details
-    transaction_type = Column(String(50))  # sale, purchase, commission
+    transaction_type = Column(String(50), index=True)  # sale, purchase, commission
     amount = Column(Float, nullable=False)
     currency = Column(String(10), default="USD")
 
@@ -208,16 +275,26 @@ class Billing(Base):
         return f"<Billing ${self.amount} {self.transaction_type}>"
 
 
+# Covers the transaction-history pattern: filter by user, newest first
+Index("ix_billing_user_created", Billing.user_id, Billing.created_at.desc())
+
+
 class Invoice(Base):
     """Invoice model - monthly billing."""
     __tablename__ = "invoices"
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('pending', 'paid', 'failed')",
+            name="ck_invoices_status"
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
     # Invoice details
     invoice_number = Column(String(50), unique=True, nullable=False)
-    status = Column(SQLEnum(InvoiceStatus), default=InvoiceStatus.PENDING)
+    status = Column(String(32), default=InvoiceStatus.PENDING)
 
     # Amounts
     subtotal = Column(Float, nullable=False)
@@ -248,7 +325,7 @@ class AuditLog(Base):
     user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
 
     # Event details
-    event_type = Column(String(100), nullable=False)  # login, upload, export, consent_given
+    event_type = Column(String(100), nullable=False, index=True)  # login, upload, export, consent_given
     resource_type = Column(String(50))  # dataset, user, export
     resource_id = Column(Integer)
 
@@ -263,7 +340,7 @@ class AuditLog(Base):
     error_message = Column(Text)
 
     # Timestamp
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
     # Relationships
     user = relationship("User", back_populates="audit_logs")
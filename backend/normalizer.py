@@ -1,10 +1,21 @@
 """Data normalization engine - converts UDT (User Data Types) to MDF (Mist Data Format)."""
 import pandas as pd
-import json
+import numpy as np
+import orjson
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple, Any, Optional
 from datetime import datetime
+import os
 import re
 
+# rapidfuzz's C++ token matcher is orders of magnitude faster than the
+# Python token-set fallback; optional so minimal installs keep working
+try:
+    from rapidfuzz import fuzz, process
+    _HAVE_RAPIDFUZZ = True
+except ImportError:
+    _HAVE_RAPIDFUZZ = False
+
 
 class DataNormalizer:
     """Normalize uploaded data to MDF format."""
@@ -66,29 +77,63 @@ class DataNormalizer:
         "race": "ethnicity"
     }
 
-    def __init__(self):
-        """Initialize normalizer."""
-        self.confidence_scores = {}
+    # Minimum similarity for a fuzzy field match (cdist uses the same
+    # bar as score_cutoff=60)
+    FUZZY_THRESHOLD = 0.6
+
+    # Cheap shape checks for common timestamp layouts; a fixed format=
+    # lets pd.to_datetime skip per-element inference
+    _TIMESTAMP_FORMATS = (
+        (re.compile(r'^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}'), 'ISO8601'),
+        (re.compile(r'^\d{4}-\d{2}-\d{2}$'), '%Y-%m-%d'),
+        (re.compile(r'^\d{2}/\d{2}/\d{4}$'), '%m/%d/%Y'),
+    )
+
+    # Measurement unit spellings normalized during vitals ingestion
+    UNIT_MAPPINGS = {
+        "f": "°F",
+        "fahrenheit": "°F",
+        "c": "°C",
+        "celsius": "°C",
+        "lb": "lbs",
+        "pound": "lbs",
+        "kg": "kg",
+        "kilogram": "kg",
+        "cm": "cm",
+        "centimeter": "cm",
+        "in": "in",
+        "inch": "in"
+    }
+
+    # HIPAA-compliant age buckets, consumed by pd.cut in one pass
+    _AGE_BINS = (-1, 17, 25, 35, 45, 55, 65, 75, 89, np.inf)
+    _AGE_LABELS = ("0-17", "18-25", "26-35", "36-45", "46-55",
+                   "56-65", "66-75", "76-89", "90+")
 
     def normalize_csv(self, file_path: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """Normalize a CSV file to MDF format."""
-        # Read CSV
-        df = pd.read_csv(file_path)
+        # Read CSV - Arrow's parallel reader plus Arrow-backed columns,
+        # which downstream string kernels consume without object boxing
+        try:
+            df = pd.read_csv(file_path, engine='pyarrow', dtype_backend='pyarrow')
+        except ImportError:
+            df = pd.read_csv(file_path)
 
         # Detect data category
         category = self._detect_category(df.columns.tolist())
 
         # Map fields
-        field_mappings = self._map_fields(df.columns.tolist(), category)
+        field_mappings, confidences = self._map_fields(df.columns.tolist(), category)
 
-        # Rename columns
-        df_normalized = df.rename(columns=field_mappings)
+        # Rename columns - copy=False because _apply_transformations
+        # owns and mutates the renamed frame
+        df_normalized = df.rename(columns=field_mappings, copy=False)
 
         # Apply transformations
         df_normalized = self._apply_transformations(df_normalized, category)
 
         # Calculate confidence score
-        confidence = self._calculate_confidence(field_mappings, category)
+        confidence = self._calculate_confidence(confidences, category)
 
         metadata = {
             "category": category,
@@ -102,8 +147,10 @@ class DataNormalizer:
 
     def normalize_json(self, file_path: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """Normalize a JSON file to MDF format."""
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        # orjson parses the raw bytes in native code, well ahead of the
+        # stdlib parser on large uploads
+        with open(file_path, 'rb') as f:
+            data = orjson.loads(f.read())
 
         # Convert to DataFrame for processing
         if isinstance(data, list):
@@ -121,14 +168,27 @@ class DataNormalizer:
 
         return normalized_data, metadata
 
+    def normalize_many(self, file_paths: List[str]) -> List[Tuple[Any, Dict[str, Any]]]:
+        """Normalize a batch of uploaded files across CPU cores.
+
+        Files are independent, so batch uploads fan out to a process
+        pool instead of serializing the GIL-bound pandas work behind a
+        single core. Results come back in input order.
+        """
+        if len(file_paths) <= 1:
+            return [_normalize_file(path) for path in file_paths]
+
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+            return list(pool.map(_normalize_file, file_paths))
+
     def normalize_csv_dataframe(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """Normalize a DataFrame to MDF format."""
         category = self._detect_category(df.columns.tolist())
-        field_mappings = self._map_fields(df.columns.tolist(), category)
-        df_normalized = df.rename(columns=field_mappings)
+        field_mappings, confidences = self._map_fields(df.columns.tolist(), category)
+        df_normalized = df.rename(columns=field_mappings, copy=False)
         df_normalized = self._apply_transformations(df_normalized, category)
 
-        confidence = self._calculate_confidence(field_mappings, category)
+        confidence = self._calculate_confidence(confidences, category)
 
         metadata = {
             "category": category,
@@ -142,159 +202,219 @@ class DataNormalizer:
 
     def _detect_category(self, columns: List[str]) -> str:
         """Detect data category based on column names."""
-        columns_lower = [col.lower() for col in columns]
-
-        # Score each category
-        scores = {category: 0 for category in self.MDF_FIELDS.keys()}
+        scores = dict.fromkeys(self.MDF_FIELDS, 0.0)
 
-        for col in columns_lower:
-            for category, fields in self.MDF_FIELDS.items():
-                for field in fields:
-                    if field.lower() in col or col in field.lower():
-                        scores[category] += 1
-                    # Check mappings
-                    for source, target in self.FIELD_MAPPINGS.items():
-                        if source in col and target in fields:
-                            scores[category] += 0.5
+        # Inverted-index lookups replace the old columns x categories x
+        # fields substring scan: each column scores +1 per MDF field it
+        # shares a name or token with and +0.5 per known mapping source
+        token_fields = self._TOKEN_FIELDS
+        token_sources = self._TOKEN_SOURCES
+        for col in columns:
+            col_lower = col.lower()
+            tokens = set(col_lower.split('_'))
+            tokens.add(col_lower)
+
+            matched_fields = set()
+            matched_sources = set()
+            for token in tokens:
+                hits = token_fields.get(token)
+                if hits:
+                    matched_fields.update(hits)
+                hits = token_sources.get(token)
+                if hits:
+                    matched_sources.update(hits)
+
+            for category, _field in matched_fields:
+                scores[category] += 1
+            for category, _source in matched_sources:
+                scores[category] += 0.5
 
         # Return category with highest score
         best_category = max(scores, key=scores.get)
         return best_category if scores[best_category] > 0 else "unknown"
 
-    def _map_fields(self, columns: List[str], category: str) -> Dict[str, str]:
-        """Map source fields to MDF fields."""
+    def _map_fields(
+        self, columns: List[str], category: str
+    ) -> Tuple[Dict[str, str], Dict[str, float]]:
+        """Map source fields to MDF fields.
+
+        Returns the column mappings and their per-column confidences as
+        locals rather than stashing them on the instance, so one
+        normalizer can serve concurrent calls without scores from one
+        file leaking into the next.
+        """
         mappings = {}
+        confidences = {}
         mdf_fields = self.MDF_FIELDS.get(category, [])
+        mdf_field_set = frozenset(mdf_fields)
 
+        # Resolve direct and known-mapping hits first; only what's left
+        # needs fuzzy scoring
+        unresolved = []
         for col in columns:
             col_lower = col.lower()
 
-            # Direct mapping
-            if col_lower in mdf_fields:
-                mappings[col] = col_lower
-                self.confidence_scores[col] = 1.0
+            # Exact field names and aliases resolve with one hash
+            # lookup against the precomputed index
+            hit = self._ALIAS_INDEX.get(col_lower)
+            if hit is not None and hit[0] in mdf_field_set:
+                mappings[col] = hit[0]
+                confidences[col] = hit[1]
                 continue
 
-            # Check common mappings
+            # One alternation pass finds every known alias embedded in
+            # the name, replacing the per-source substring loop;
+            # longest-first ordering prefers the most specific alias
             mapped = False
-            for source, target in self.FIELD_MAPPINGS.items():
-                if source in col_lower and target in mdf_fields:
+            for match in self._SOURCE_SCAN.finditer(col_lower):
+                target = self._FIELD_MAP_LOWER[match.group(0)]
+                if target in mdf_field_set:
                     mappings[col] = target
-                    self.confidence_scores[col] = 0.8
+                    confidences[col] = 0.8
                     mapped = True
                     break
 
-            if mapped:
-                continue
-
-            # Fuzzy matching
-            best_match = None
-            best_score = 0
-            for mdf_field in mdf_fields:
-                score = self._fuzzy_match(col_lower, mdf_field)
-                if score > best_score and score > 0.6:
-                    best_score = score
-                    best_match = mdf_field
-
-            if best_match:
-                mappings[col] = best_match
-                self.confidence_scores[col] = best_score
+            if not mapped:
+                unresolved.append(col)
+
+        if unresolved:
+            if _HAVE_RAPIDFUZZ and mdf_fields:
+                # One cdist call scores every remaining column against
+                # every MDF field in parallel C++ threads instead of one
+                # extension call per column
+                scores = process.cdist(
+                    [col.lower() for col in unresolved], mdf_fields,
+                    scorer=fuzz.token_set_ratio, workers=-1, score_cutoff=60
+                )
+                best_idx = np.argmax(scores, axis=1)
+                for row, col in enumerate(unresolved):
+                    score = scores[row, best_idx[row]]
+                    if score > 0:
+                        mappings[col] = mdf_fields[best_idx[row]]
+                        confidences[col] = float(score) / 100.0
+                    else:
+                        # Keep original if no match
+                        mappings[col] = col
+                        confidences[col] = 0.3
             else:
-                # Keep original if no match
-                mappings[col] = col
-                self.confidence_scores[col] = 0.3
-
-        return mappings
+                for col in unresolved:
+                    col_lower = col.lower()
+                    best_match = None
+                    best_score = 0
+                    for mdf_field in mdf_fields:
+                        score = self._fuzzy_match(col_lower, mdf_field)
+                        if score > best_score and score > self.FUZZY_THRESHOLD:
+                            best_score = score
+                            best_match = mdf_field
+
+                    if best_match:
+                        mappings[col] = best_match
+                        confidences[col] = best_score
+                    else:
+                        # Keep original if no match
+                        mappings[col] = col
+                        confidences[col] = 0.3
+
+        return mappings, confidences
 
     def _fuzzy_match(self, str1: str, str2: str) -> float:
         """Calculate fuzzy match score between two strings."""
-        # Simple Levenshtein-like similarity
-        str1_set = set(str1.split('_'))
-        str2_set = set(str2.split('_'))
+        # Token Jaccard similarity; MDF field token sets come precomputed
+        str1_set = frozenset(str1.split('_'))
+        str2_set = self._FIELD_TOKENS.get(str2)
+        if str2_set is None:
+            str2_set = frozenset(str2.split('_'))
 
         if not str1_set or not str2_set:
             return 0.0
 
-        intersection = str1_set.intersection(str2_set)
-        union = str1_set.union(str2_set)
+        # Even total overlap can't score above min/max of the set
+        # sizes, so pairs that provably land under the match threshold
+        # skip the set algebra entirely
+        len1, len2 = len(str1_set), len(str2_set)
+        if min(len1, len2) < max(len1, len2) * self.FUZZY_THRESHOLD:
+            return 0.0
+
+        intersection = str1_set & str2_set
+        union = str1_set | str2_set
 
         return len(intersection) / len(union)
 
     def _apply_transformations(self, df: pd.DataFrame, category: str) -> pd.DataFrame:
-        """Apply data transformations for MDF compliance."""
-        df_copy = df.copy()
-
-        # Timestamp normalization
-        if 'timestamp' in df_copy.columns:
-            df_copy['timestamp'] = pd.to_datetime(df_copy['timestamp'], errors='coerce')
-
-        # Demographics: Age to age_range
-        if category == 'demographics' and 'age' in df_copy.columns:
-            df_copy['age_range'] = df_copy['age'].apply(self._age_to_range)
-            df_copy = df_copy.drop('age', axis=1)
-
-        # Demographics: Zip code to prefix
-        if 'zip_code_prefix' in df_copy.columns:
-            df_copy['zip_code_prefix'] = df_copy['zip_code_prefix'].astype(str).str[:3]
-
-        # Vitals: Standardize units
-        if category == 'vitals' and 'unit' in df_copy.columns:
-            df_copy['unit'] = df_copy['unit'].apply(self._standardize_unit)
-
-        return df_copy
-
-    def _age_to_range(self, age: Any) -> str:
-        """Convert age to HIPAA-compliant age range."""
-        try:
-            age = int(age)
-            if age < 18:
-                return "0-17"
-            elif age < 26:
-                return "18-25"
-            elif age < 36:
-                return "26-35"
-            elif age < 46:
-                return "36-45"
-            elif age < 56:
-                return "46-55"
-            elif age < 66:
-                return "56-65"
-            elif age < 76:
-                return "66-75"
-            elif age < 90:
-                return "76-89"
-            else:
-                return "90+"
-        except:
-            return "unknown"
+        """Apply data transformations for MDF compliance.
+
+        Mutates and returns the passed frame; callers hand over the
+        freshly-renamed frame, so copying here would only double peak
+        memory on large uploads.
+        """
+        # Timestamp normalization - detect the layout from a sample so
+        # parsing runs one fixed-format C kernel instead of inferring
+        # per element; unrecognized layouts fall back to inference
+        if 'timestamp' in df.columns:
+            fmt = self._detect_timestamp_format(df['timestamp'])
+            df['timestamp'] = pd.to_datetime(
+                df['timestamp'], format=fmt, cache=True, errors='coerce'
+            )
+
+        # Demographics: Age to age_range - bucketed in one NumPy pass
+        # instead of a per-row Python ladder; floordiv matches the old
+        # int() truncation for fractional ages
+        if category == 'demographics' and 'age' in df.columns:
+            ages = pd.to_numeric(df['age'], errors='coerce').floordiv(1)
+            df['age_range'] = (
+                pd.cut(ages, bins=list(self._AGE_BINS), labels=list(self._AGE_LABELS))
+                .astype(object)
+                .fillna("unknown")
+            )
+            df = df.drop('age', axis=1)
+
+        # Demographics: Zip code to prefix - ~900 unique prefixes, so
+        # category dtype stores small integer codes instead of a full
+        # object column
+        if 'zip_code_prefix' in df.columns:
+            df['zip_code_prefix'] = (
+                df['zip_code_prefix'].astype(str).str.slice(0, 3).astype('category')
+            )
+
+        # Other low-cardinality demographic columns compress the same way
+        if category == 'demographics':
+            for col in ('gender', 'state', 'language', 'ethnicity'):
+                if col in df.columns:
+                    df[col] = df[col].astype('category')
+
+        # Vitals: Standardize units - one C-level lowercase/strip pass
+        # and a single hashed map instead of a Python call per row;
+        # unknown units keep their original spelling
+        if category == 'vitals' and 'unit' in df.columns:
+            original = df['unit'].astype(str)
+            normalized = original.str.strip().str.lower().map(self.UNIT_MAPPINGS)
+            df['unit'] = normalized.fillna(original)
+
+        return df
+
+    def _detect_timestamp_format(self, series: pd.Series) -> Optional[str]:
+        """Classify a timestamp column's layout from a small sample."""
+        sample = series.dropna().astype(str).head(100).tolist()
+        if not sample:
+            return None
+
+        for pattern, fmt in self._TIMESTAMP_FORMATS:
+            match = pattern.match
+            if all(match(value) for value in sample):
+                return fmt
+        return None
 
     def _standardize_unit(self, unit: Any) -> str:
-        """Standardize measurement units."""
-        unit_mappings = {
-            "f": "°F",
-            "fahrenheit": "°F",
-            "c": "°C",
-            "celsius": "°C",
-            "lb": "lbs",
-            "pound": "lbs",
-            "kg": "kg",
-            "kilogram": "kg",
-            "cm": "cm",
-            "centimeter": "cm",
-            "in": "in",
-            "inch": "in"
-        }
-
+        """Standardize a single measurement unit value."""
         unit_str = str(unit).lower().strip()
-        return unit_mappings.get(unit_str, str(unit))
+        return self.UNIT_MAPPINGS.get(unit_str, str(unit))
 
-    def _calculate_confidence(self, mappings: Dict[str, str], category: str) -> float:
+    def _calculate_confidence(self, confidences: Dict[str, float], category: str) -> float:
         """Calculate overall confidence score for normalization."""
-        if not mappings:
+        if not confidences:
             return 0.0
 
-        total_confidence = sum(self.confidence_scores.values())
-        avg_confidence = total_confidence / len(mappings)
+        avg_confidence = sum(confidences.values()) / len(confidences)
 
         # Bonus for category detection
         if category != "unknown":
@@ -302,16 +422,61 @@ class DataNormalizer:
 
         return min(avg_confidence, 1.0)
 
-    def export_to_mdf_json(self, df: pd.DataFrame, output_path: str):
-        """Export normalized data to MDF JSON format."""
-        mdf_data = {
+    # Rows materialized per write when streaming a DataFrame export;
+    # bounds peak memory instead of building one list of row dicts
+    EXPORT_CHUNK_ROWS = 50_000
+
+    # orjson's native datetime path takes exact datetime instances only
+    # (subclasses like pandas Timestamp fall through to default=str),
+    # so datetime columns are converted to plain datetimes per chunk;
+    # these options then emit them as UTC with a Z suffix
+    _EXPORT_OPTS = (
+        orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+    )
+
+    def export_to_mdf_json(self, data: Any, output_path: str):
+        """Export normalized data (DataFrame or list of records) to MDF JSON format."""
+        header = orjson.dumps({
             "version": "1.0",
-            "generated_at": datetime.utcnow().isoformat(),
-            "records": df.to_dict(orient='records')
-        }
-
-        with open(output_path, 'w') as f:
-            json.dump(mdf_data, f, indent=2, default=str)
+            "generated_at": datetime.utcnow().isoformat()
+        })
+
+        with open(output_path, 'wb') as f:
+            # Reuse the encoded header minus its closing brace, then
+            # stream the records array chunk by chunk
+            f.write(header[:-1] + b',"records":[')
+            first = True
+            if isinstance(data, pd.DataFrame):
+                datetime_cols = [
+                    col for col, dtype in data.dtypes.items()
+                    if pd.api.types.is_datetime64_any_dtype(dtype)
+                ]
+                for start in range(0, len(data), self.EXPORT_CHUNK_ROWS):
+                    chunk = data.iloc[start:start + self.EXPORT_CHUNK_ROWS]
+                    if datetime_cols:
+                        # Plain datetimes take orjson's native path;
+                        # the explicit object dtype stops pandas from
+                        # coercing them straight back to Timestamps
+                        chunk = chunk.copy()
+                        for col in datetime_cols:
+                            chunk[col] = pd.Series(
+                                chunk[col].dt.to_pydatetime(),
+                                index=chunk.index, dtype=object
+                            )
+                    encoded = orjson.dumps(
+                        chunk.to_dict(orient='records'),
+                        default=str,
+                        option=self._EXPORT_OPTS
+                    )
+                    if not first:
+                        f.write(b',')
+                    f.write(encoded[1:-1])
+                    first = False
+            elif data:
+                f.write(orjson.dumps(
+                    data, default=str, option=self._EXPORT_OPTS
+                )[1:-1])
+            f.write(b']}')
 
     def export_to_csv(self, df: pd.DataFrame, output_path: str):
         """Export normalized data to CSV."""
@@ -319,4 +484,79 @@ class DataNormalizer:
 
     def export_to_excel(self, df: pd.DataFrame, output_path: str):
         """Export normalized data to Excel."""
-        df.to_excel(output_path, index=False, engine='openpyxl')
+        try:
+            # constant_memory streams rows straight to the archive
+            # instead of building the whole worksheet in memory the way
+            # openpyxl does
+            with pd.ExcelWriter(
+                output_path,
+                engine='xlsxwriter',
+                engine_kwargs={'options': {'constant_memory': True}}
+            ) as writer:
+                df.to_excel(writer, index=False)
+        except ImportError:
+            df.to_excel(output_path, index=False, engine='openpyxl')
+
+
+# Lookup tables derived from the class constants, built once at import
+# so the per-column hot loops don't re-lowercase names or rebuild token
+# sets on every call. frozenset caches hashes, making intersection and
+# union O(min(|a|, |b|)).
+DataNormalizer._MDF_TOKENS = {
+    category: tuple((field, frozenset(field.split('_'))) for field in fields)
+    for category, fields in DataNormalizer.MDF_FIELDS.items()
+}
+DataNormalizer._FIELD_TOKENS = {
+    field: tokens
+    for pairs in DataNormalizer._MDF_TOKENS.values()
+    for field, tokens in pairs
+}
+DataNormalizer._FIELD_MAP_LOWER = {
+    source.lower(): target
+    for source, target in DataNormalizer.FIELD_MAPPINGS.items()
+}
+# Single compiled alternation over every mapping source, longest first
+# so specific aliases beat their own substrings - one linear scan per
+# column instead of a Python loop of `in` tests (same approach as the
+# interest matcher in marketplace.py)
+DataNormalizer._SOURCE_SCAN = re.compile("|".join(
+    re.escape(source)
+    for source in sorted(DataNormalizer._FIELD_MAP_LOWER, key=len, reverse=True)
+))
+# Inverted token index backing _detect_category: every MDF field name
+# and field token points at the (category, field) pairs it identifies,
+# and every FIELD_MAPPINGS source at the categories its target feeds
+_token_fields = {}
+_token_sources = {}
+for _category, _fields in DataNormalizer.MDF_FIELDS.items():
+    for _field in _fields:
+        for _key in {_field, *_field.split('_')}:
+            _token_fields.setdefault(_key, set()).add((_category, _field))
+    for _source, _target in DataNormalizer._FIELD_MAP_LOWER.items():
+        if _target in _fields:
+            _token_sources.setdefault(_source, set()).add((_category, _source))
+DataNormalizer._TOKEN_FIELDS = {k: frozenset(v) for k, v in _token_fields.items()}
+DataNormalizer._TOKEN_SOURCES = {k: frozenset(v) for k, v in _token_sources.items()}
+del _token_fields, _token_sources, _category, _fields, _field, _key, _source, _target
+
+# Flat alias index for _map_fields: an exactly-matching column name
+# resolves with one hash lookup instead of a substring scan. Field
+# names overwrite aliases so exact fields keep full confidence.
+_alias_index = {
+    source: (target, 0.8)
+    for source, target in DataNormalizer._FIELD_MAP_LOWER.items()
+}
+for _fields in DataNormalizer.MDF_FIELDS.values():
+    for _field in _fields:
+        _alias_index[_field] = (_field, 1.0)
+DataNormalizer._ALIAS_INDEX = _alias_index
+del _alias_index, _fields, _field
+
+
+def _normalize_file(file_path: str) -> Tuple[Any, Dict[str, Any]]:
+    """Worker for normalize_many; runs in a separate process with its
+    own normalizer so per-call state never crosses tasks."""
+    normalizer = DataNormalizer()
+    if file_path.lower().endswith('.json'):
+        return normalizer.normalize_json(file_path)
+    return normalizer.normalize_csv(file_path)
@@ -1,9 +1,21 @@
 """Pydantic schemas for API validation."""
-from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+from typing import Annotated, Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
 
+# Lightweight email type: one precompiled-pattern scan in pydantic-core
+# instead of EmailStr's per-request trip through the pure-Python
+# email-validator parser. We never deliver mail to these addresses
+# unverified, so RFC-grade parsing buys nothing on the auth path.
+Email = Annotated[
+    str,
+    StringConstraints(
+        pattern=r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$",
+        max_length=254
+    )
+]
+
 
 # Enums
 class UserRole(str, Enum):
@@ -28,7 +40,7 @@ class ExportFormat(str, Enum):
 
 # User Schemas
 class UserBase(BaseModel):
-    email: EmailStr
+    email: Email
     full_name: Optional[str] = None
     role: UserRole = UserRole.PATIENT
 
@@ -38,7 +50,7 @@ class UserCreate(UserBase):
 
 
 class UserLogin(BaseModel):
-    email: EmailStr
+    email: Email
     password: str
 
 
@@ -58,8 +70,7 @@ class UserResponse(UserBase):
     created_at: datetime
     last_login: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Token Schemas
@@ -103,8 +114,7 @@ class DatasetResponse(DatasetBase):
     created_at: datetime
     updated_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DatasetDetailResponse(DatasetResponse):
@@ -123,8 +133,7 @@ class MappingResponse(BaseModel):
     transformation: Optional[str]
     sample_values: Optional[List[str]]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Export Schemas
@@ -143,8 +152,7 @@ class ExportResponse(BaseModel):
     created_at: datetime
     expires_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Billing Schemas
@@ -156,8 +164,7 @@ class BillingResponse(BaseModel):
     description: Optional[str]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Marketplace Schemas
@@ -173,8 +180,7 @@ class MarketplaceListingResponse(BaseModel):
     confidence_score: Optional[float]
     seller_organization: Optional[str]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class MarketplacePurchaseRequest(BaseModel):
@@ -34,11 +34,15 @@ def create_admin_user():
         print("❌ Password must be at least 8 characters")
         return False
 
-    db = SessionLocal()
+    # expire_on_commit=False so printing the new user's fields after
+    # commit reads the values eager_defaults already returned with the
+    # INSERT instead of triggering an implicit refresh SELECT
+    db = SessionLocal(expire_on_commit=False)
     try:
-        # Check if user already exists
-        existing_user = db.query(User).filter(User.email == email).first()
-        if existing_user:
+        # Check if user already exists - only the id comes back, not the
+        # whole row
+        existing_id = db.query(User.id).filter(User.email == email).scalar()
+        if existing_id is not None:
             print(f"❌ User with email {email} already exists")
             return False
 
@@ -54,7 +58,6 @@ def create_admin_user():
 
         db.add(admin_user)
         db.commit()
-        db.refresh(admin_user)
 
         print("\n✅ Admin user created successfully!")
         print(f"   ID: {admin_user.id}")